@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+"""Latency and throughput benchmark for the asyncio token game service."""
+
+import argparse
+import asyncio
+import random
+import time
+
+from swiftfire.artifacts.nets.petri_net.petri_net import PetriNet
+from swiftfire.services.token_game_service import TokenGameService
+
+
+def build_net(branches: int, length: int) -> PetriNet:
+    """
+    Builds a cyclic Petri net with a fork into parallel branches of sequential transitions, followed by a join.
+    :param branches: the number of parallel branches
+    :type branches: integer
+    :param length: the number of transitions in each branch
+    :type length: integer
+    :return: the Petri net, whose initial marking is one token in place 0
+    :rtype: swiftfire.artifacts.nets.petri_net.petri_net.PetriNet
+    """
+    places = 1 + branches * (length + 1)
+    transitions = 2 + branches * length
+    net = PetriNet(places, transitions)
+    fork, join = places, places + 1
+    net.add_arc(0, fork)
+    net.add_arc(join, 0)
+    for branch in range(branches):
+        first_place = 1 + branch * (length + 1)
+        first_transition = places + 2 + branch * length
+        net.add_arc(fork, first_place)
+        for step in range(length):
+            net.add_arc(first_place + step, first_transition + step)
+            net.add_arc(first_transition + step, first_place + step + 1)
+        net.add_arc(first_place + length, join)
+    return net
+
+
+async def drive_instance(service: TokenGameService, instance: int, events: int, rng: random.Random, latencies: list):
+    """
+    Event generator for one instance: repeatedly queries the enabled transitions and fires one of them at random.
+    :param service: the token game service hosting the instance
+    :type service: swiftfire.services.token_game_service.TokenGameService
+    :param instance: the id of the instance
+    :type instance: integer
+    :param events: the number of events to generate
+    :type events: integer
+    :param rng: the random number generator choosing the transition to fire
+    :type rng: random.Random
+    :param latencies: the list collecting the latency in seconds of each event
+    :type latencies: list of floats
+    :return: None
+    :rtype: NoneType
+    """
+    for _ in range(events):
+        start = time.perf_counter()
+        enabled = await service.enabled(instance)
+        await service.fire(instance, rng.choice(sorted(enabled)))
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(models: int, instances: int, events: int, branches: int, length: int, batch_size: int, seed: int):
+    """
+    Runs the benchmark and prints throughput and latency percentiles.
+    :param models: the number of models
+    :type models: integer
+    :param instances: the number of instances, assigned to models round-robin
+    :type instances: integer
+    :param events: the number of events generated per instance
+    :type events: integer
+    :param branches: the number of parallel branches in each model
+    :type branches: integer
+    :param length: the number of transitions in each branch
+    :type length: integer
+    :param batch_size: the maximum number of commands processed in one batch
+    :type batch_size: integer
+    :param seed: the seed of the random number generators
+    :type seed: integer
+    :return: None
+    :rtype: NoneType
+    """
+    service = TokenGameService(max_batch_size=batch_size)
+    for model in range(models):
+        service.add_model(model, build_net(branches, length))
+    for instance in range(instances):
+        service.add_instance(instance, instance % models, {0: 1})
+    rng = random.Random(seed)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(drive_instance(service, instance, events, random.Random(rng.random()), latencies) for instance in range(instances)))
+    elapsed = time.perf_counter() - start
+    await service.close()
+    latencies.sort()
+    commands = 2 * len(latencies)
+    print('instances: {}, models: {}, max batch size: {}'.format(instances, models, batch_size))
+    print('commands: {}, elapsed: {:.3f} s, throughput: {:.0f} commands/s'.format(commands, elapsed, commands / elapsed))
+    print('event latency (enabled + fire): p50 {:.3f} ms, p99 {:.3f} ms, max {:.3f} ms'.format(
+        1000 * latencies[len(latencies) // 2], 1000 * latencies[int(len(latencies) * 0.99)], 1000 * latencies[-1]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--models', type=int, default=4)
+    parser.add_argument('--instances', type=int, default=2000)
+    parser.add_argument('--events', type=int, default=50)
+    parser.add_argument('--branches', type=int, default=8)
+    parser.add_argument('--length', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=1024)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(run(args.models, args.instances, args.events, args.branches, args.length, args.batch_size, args.seed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+from collections import deque
+from typing import Dict, Iterable, Set, Tuple, Union
+
+from swiftfire.artifacts.graphs.swiftfire_graph import SwiftFireGraph
+from swiftfire.artifacts.nets.petri_net import petri_net
+from swiftfire.semantics.enablement_rules import petri_net_enablement_rules
+from swiftfire.semantics.firing_rules import petri_net_firing_rules
+
+
+class ReductionResult:
+    """
+    Class defining the result of the reduction of a Petri net.
+    """
+
+    def __init__(self, net: Union[petri_net.PetriNet, SwiftFireGraph], marking: Dict[int, int], mapping: Dict[int, Tuple[int, ...]], eliminated: Set[int]):
+        """
+        Constructor for the reduction result defined by the ReductionResult class.
+        :param net: the reduced net (or graph), with consecutive node ids
+        :type net: swiftfire.artifacts.nets.petri_net.petri_net.PetriNet or swiftfire.artifacts.graphs.swiftfire_graph.SwiftFireGraph
+        :param marking: the initial marking of the reduced net
+        :type marking: dictionary of integer: integer
+        :param mapping: for each node of the reduced net, the ids of the original nodes fused into it
+        :type mapping: dictionary of integer: tuple of integers
+        :param eliminated: the ids of the original nodes removed as redundant, including those fused into removed places
+        :type eliminated: set of integers
+        """
+        self.__net = net
+        self.__marking = marking
+        self.__mapping = mapping
+        self.__eliminated = eliminated
+
+    def __get_net(self):
+        return self.__net
+
+    def __get_marking(self):
+        return self.__marking
+
+    def __get_mapping(self):
+        return self.__mapping
+
+    def __get_eliminated(self):
+        return self.__eliminated
+
+    net = property(__get_net)
+    marking = property(__get_marking)
+    mapping = property(__get_mapping)
+    eliminated = property(__get_eliminated)
+
+
+class MurataReduction:
+    """
+    Class defining the behaviour-preserving reduction rules of Murata on Petri nets: fusion of series places, fusion of
+    series transitions, elimination of self-loop places and elimination of parallel places. The reductions preserve
+    liveness, safeness, boundedness and the absence of deadlocks; fused transitions are not observable in the reduced
+    net. Rules are applied from a worklist seeded with every node, and a node is only revisited when a change around it
+    can make a rule applicable; parallel places are found through an index of places by preset, postset and marking,
+    kept for the whole reduction.
+    """
+
+    @staticmethod
+    def reduce_net(net: petri_net.PetriNet, marking: Dict[int, int] = None) -> ReductionResult:
+        """
+        Reduces a Petri net given its initial marking.
+        :param net: a Petri net with the standard enablement and firing rules
+        :type net: swiftfire.artifacts.nets.petri_net.petri_net.PetriNet
+        :param marking: the initial marking of the Petri net
+        :type marking: dictionary of integer: integer
+        :return: the reduced Petri net, its initial marking and the mapping to the original node ids
+        :rtype: swiftfire.algorithms.reduction.murata_reduction.ReductionResult
+        """
+        if net.enablement_rule is not petri_net_enablement_rules.EnablementRule or net.firing_rule is not petri_net_firing_rules.FiringRule:
+            raise ValueError('Only Petri nets with the standard enablement and firing rules can be reduced.')
+        marking = {} if marking is None else marking
+        if not net.is_a_marking(marking):
+            raise ValueError('Invalid marking for the Petri net.')
+        node_types, arcs, reduced_marking, mapping, eliminated = MurataReduction.__reduce_adjacency(net.graph, marking)
+        places = node_types.count(0)
+        reduced_net = petri_net.PetriNet(places, len(node_types) - places, arcs)
+        return ReductionResult(reduced_net, reduced_marking, mapping, eliminated)
+
+    @staticmethod
+    def reduce_graph(graph: SwiftFireGraph, marking: Dict[int, int] = None) -> ReductionResult:
+        """
+        Reduces the bipartite graph of a Petri net given its initial marking. Nodes of type 0 are places.
+        :param graph: a directed bipartite graph
+        :type graph: swiftfire.artifacts.graphs.swiftfire_graph.SwiftFireGraph
+        :param marking: the initial marking of the Petri net
+        :type marking: dictionary of integer: integer
+        :return: the reduced graph, its initial marking and the mapping to the original node ids
+        :rtype: swiftfire.algorithms.reduction.murata_reduction.ReductionResult
+        """
+        marking = {} if marking is None else marking
+        for place, tokens in marking.items():
+            if not isinstance(place, int) or not 0 <= place < graph.vcount() or graph.vs[place]['type'] or not isinstance(tokens, int) or tokens < 0:
+                raise ValueError('Invalid marking for the graph.')
+        node_types, arcs, reduced_marking, mapping, eliminated = MurataReduction.__reduce_adjacency(graph, marking)
+        return ReductionResult(SwiftFireGraph(node_types, arcs), reduced_marking, mapping, eliminated)
+
+    @staticmethod
+    def __reduce_adjacency(graph: SwiftFireGraph, marking: Dict[int, int]):
+        types = graph.vs['type']
+        pre = [set(neighbors) for neighbors in graph.get_adjlist(mode='in')]
+        post = [set(neighbors) for neighbors in graph.get_adjlist(mode='out')]
+        tokens = [0] * len(types)
+        for place, count in marking.items():
+            tokens[place] = count
+        groups = [[node] for node in range(len(types))]
+        alive = [True] * len(types)
+        eliminated = set()
+
+        def remove(node: int) -> Set[int]:
+            neighbors = pre[node] | post[node]
+            for neighbor in pre[node]:
+                post[neighbor].discard(node)
+            for neighbor in post[node]:
+                pre[neighbor].discard(node)
+            pre[node], post[node] = set(), set()
+            alive[node] = False
+            return neighbors
+
+        def merge_groups(target: int, *sources: int):
+            # The largest group is extended, so that each original node is copied O(log n) times overall
+            largest = max((target,) + sources, key=lambda node: len(groups[node]))
+            merged = groups[largest]
+            for node in (target,) + sources:
+                if node != largest:
+                    merged += groups[node]
+                    groups[node] = []
+            groups[target] = merged
+
+        def fuse_series_places(transition: int) -> Iterable[int]:
+            # Fusion of series places: •t = {p1}, t• = {p2}, p1• = {t}, •p1 not empty; p1 and t are fused into p2
+            if len(pre[transition]) != 1 or len(post[transition]) != 1:
+                return ()
+            (first,), (second,) = pre[transition], post[transition]
+            # If p1 has no input transitions t fires a bounded number of times, and is not live; shared input
+            # transitions would need arc weights in the fused place
+            if first == second or post[first] != {transition} or not pre[first] or not pre[first].isdisjoint(pre[second]):
+                return ()
+            inputs = set(pre[first])
+            touched = remove(first) | remove(transition)
+            for node in inputs:
+                post[node].add(second)
+            pre[second] |= inputs
+            tokens[second] += tokens[first]
+            merge_groups(second, first, transition)
+            return touched | inputs
+
+        def fuse_series_transitions(place: int) -> Iterable[int]:
+            # Fusion of series transitions: •p = {t1}, p• = {t2}, •t2 = {p}, t2• not empty, p unmarked; p and t2 are
+            # fused into t1
+            if tokens[place] or len(pre[place]) != 1 or len(post[place]) != 1:
+                return ()
+            (first,), (second,) = pre[place], post[place]
+            # If t2 has no output places, fusing it would hide that p can grow unboundedly; p is not in t2• since •p = {t1}
+            if first == second or pre[second] != {place} or not post[second] or not post[first].isdisjoint(post[second]):
+                return ()
+            outputs = set(post[second])
+            touched = remove(place) | remove(second)
+            for node in outputs:
+                pre[node].add(first)
+            post[first] |= outputs
+            merge_groups(first, second, place)
+            return touched | outputs
+
+        def eliminate_self_loop_place(place: int) -> Iterable[int]:
+            # Elimination of self-loop places: a place with one token whose transitions all give back the token they
+            # take; more tokens would make the net unsafe
+            if tokens[place] != 1 or not pre[place] or pre[place] != post[place]:
+                return ()
+            eliminated.update(groups[place])
+            return remove(place)
+
+        # Index of places by (preset, postset, marking), kept for the whole reduction; entries may be stale, and are
+        # checked against the current adjacency when looked up
+        signatures = {}
+
+        def eliminate_parallel_place(place: int) -> Iterable[int]:
+            # Elimination of parallel places: places with the same preset, postset and marking always hold the same
+            # number of tokens, so all but one are redundant
+            if not (pre[place] or post[place]):
+                return ()
+            signature = (frozenset(pre[place]), frozenset(post[place]), tokens[place])
+            other = signatures.get(signature)
+            if other is None or other == place or not alive[other] or pre[other] != signature[0] or post[other] != signature[1] or tokens[other] != signature[2]:
+                signatures[signature] = place
+                return ()
+            eliminated.update(groups[place])
+            return remove(place)
+
+        # Arcs are only removed together with one of their nodes, and all the neighbors of a removed node are reported
+        # as changed, so a rule can only become applicable at a node if the node itself changed, or if the node reads
+        # the adjacency of a changed neighbor that can grow without blocking the rule: a fusion of series places at t
+        # reads the preset of its only input place p1, whose postset is {t}, and a fusion of series transitions at p
+        # reads the postset of its only output transition t2, whose preset is {p}. Revisiting only those nodes keeps
+        # the number of revisits per change constant, even around nodes with many neighbors.
+        worklist = deque(range(len(types)))
+        queued = [True] * len(types)
+
+        def revisit(node: int):
+            if alive[node] and not queued[node]:
+                queued[node] = True
+                worklist.append(node)
+
+        while worklist:
+            node = worklist.popleft()
+            queued[node] = False
+            if not alive[node]:
+                continue
+            if types[node]:
+                touched = fuse_series_places(node)
+            else:
+                touched = eliminate_self_loop_place(node) or fuse_series_transitions(node) or eliminate_parallel_place(node)
+            for changed in touched:
+                revisit(changed)
+                if not types[changed] and len(post[changed]) == 1:
+                    revisit(next(iter(post[changed])))
+                elif types[changed] and len(pre[changed]) == 1:
+                    revisit(next(iter(pre[changed])))
+
+        # Places first, then transitions, as in the PetriNet constructor
+        survivors = sorted((node for node in range(len(types)) if alive[node]), key=lambda node: (types[node], node))
+        new_ids = {node: new_id for new_id, node in enumerate(survivors)}
+        node_types = [types[node] for node in survivors]
+        arcs = [(new_ids[node], new_ids[target]) for node in survivors for target in sorted(post[node])]
+        reduced_marking = {new_ids[node]: tokens[node] for node in survivors if not types[node] and tokens[node]}
+        mapping = {new_ids[node]: tuple(sorted(groups[node])) for node in survivors}
+        return node_types, arcs, reduced_marking, mapping, eliminated
@@ -1,4 +1,6 @@
-from typing import Dict, Set
+from typing import Dict, Set, Iterable, Optional
+from collections import Counter
+from random import Random
 
 from swiftfire.artifacts.nets.petri_net import petri_net
 
@@ -9,7 +11,7 @@ class EnablementRule:
     """
 
     @staticmethod
-    def is_enabled(net: petri_net.PetriNet, marking: Dict[int, int], transition: int) -> bool:
+    def is_enabled(net: 'petri_net.PetriNet', marking: Dict[int, int], transition: int) -> bool:
         """
         Checks if a transition is enabled given a Petri net and a marking.
         :param net: a Petri net
@@ -27,7 +29,7 @@ class EnablementRule:
         return True
 
     @staticmethod
-    def enabled_transitions(net: petri_net.PetriNet, marking: Dict[int, int]) -> Set[int]:
+    def enabled_transitions(net: 'petri_net.PetriNet', marking: Dict[int, int]) -> Set[int]:
         """
         Returns the set of ids of enabled transitions given a Petri net and a marking.
         :param net: a Petri net
@@ -39,6 +41,61 @@ class EnablementRule:
         """
         return {transition for transition in net.transitions if EnablementRule.is_enabled(net, marking, transition)}
 
+    @staticmethod
+    def is_step_enabled(net: 'petri_net.PetriNet', marking: Dict[int, int], step: Iterable[int], consumed: Optional[Counter] = None) -> bool:
+        """
+        Checks if a step (a multiset of transitions to be fired concurrently) is enabled given a Petri net and a marking.
+        A step is enabled if every place holds enough tokens to be consumed by all the transitions of the step that
+        have it in their preset.
+        :param net: a Petri net
+        :type net: swiftfire.artifacts.nets.petri_net.petri_net.PetriNet
+        :param marking: the current marking of the Petri net
+        :type marking: dictionary of integer: integer
+        :param step: the ids of the transitions in the step
+        :type step: iterable of integers
+        :param consumed: the number of tokens the step consumes from each place, if already computed from the presets
+        :type consumed: collections.Counter of integer: integer
+        :return: True if the step is enabled, False otherwise
+        :rtype: boolean
+        """
+        if consumed is None:
+            consumed = Counter()
+            for transition in step:
+                consumed.update(net.preset(transition))
+        for place, tokens in consumed.items():
+            if marking.get(place, 0) < tokens:
+                return False
+        return True
+
+    @staticmethod
+    def maximal_step(net: 'petri_net.PetriNet', marking: Dict[int, int], rng: Optional[Random] = None) -> Set[int]:
+        """
+        Computes a maximal step given a Petri net and a marking, i.e. a set of enabled transitions that can fire
+        concurrently and that cannot be extended by any other enabled transition. Transitions are selected greedily
+        by consuming the tokens in their presets, so that no two transitions in the step compete for the same token.
+        :param net: a Petri net
+        :type net: swiftfire.artifacts.nets.petri_net.petri_net.PetriNet
+        :param marking: the current marking of the Petri net
+        :type marking: dictionary of integer: integer
+        :param rng: a random number generator used to choose among conflicting transitions; if None, transitions
+        are considered in order of id
+        :type rng: random.Random
+        :return: the set of ids of the transitions in the step
+        :rtype: set of integers
+        """
+        candidates = [transition for transition in sorted(net.transitions) if net.enablement_rule.is_enabled(net, marking, transition)]
+        if rng is not None:
+            rng.shuffle(candidates)
+        available = dict(marking)
+        step = set()
+        for transition in candidates:
+            preset = net.preset(transition)
+            if all(available.get(place, 0) > 0 for place in preset):
+                for place in preset:
+                    available[place] -= 1
+                step.add(transition)
+        return step
+
 
 class EnablementRuleInhibitorArcs(EnablementRule):
     """
@@ -46,7 +103,7 @@ class EnablementRuleInhibitorArcs(EnablementRule):
     """
 
     @staticmethod
-    def is_enabled(net: petri_net.PetriNet, marking: Dict[int, int], transition: int) -> bool:
+    def is_enabled(net: 'petri_net.PetriNet', marking: Dict[int, int], transition: int) -> bool:
         """
         Checks if a transition is enabled given a Petri net and a marking.
         :param net: a Petri net
@@ -60,3 +117,20 @@ class EnablementRuleInhibitorArcs(EnablementRule):
         """
         # TODO: implement
         raise NotImplementedError
+
+    @staticmethod
+    def is_step_enabled(net: 'petri_net.PetriNet', marking: Dict[int, int], step: Iterable[int], consumed: Optional[Counter] = None) -> bool:
+        """
+        Checks if a step (a multiset of transitions to be fired concurrently) is enabled given a Petri net and a marking.
+        :param net: a Petri net
+        :type net: swiftfire.artifacts.nets.petri_net.petri_net.PetriNet
+        :param marking: the current marking of the Petri net
+        :type marking: dictionary of integer: integer
+        :param step: the ids of the transitions in the step
+        :type step: iterable of integers
+        :param consumed: the number of tokens the step consumes from each place, if already computed from the presets
+        :type consumed: collections.Counter of integer: integer
+        :return: True if the step is enabled, False otherwise
+        :rtype: boolean
+        """
+        raise NotImplementedError('Step semantics are not supported for nets with inhibitor arcs.')
@@ -1,4 +1,5 @@
-from typing import Dict
+from typing import Dict, Iterable
+from collections import Counter
 
 from swiftfire.artifacts.nets.petri_net import petri_net
 
@@ -17,7 +18,7 @@ class FiringRule:
     """
 
     @staticmethod
-    def fire(net: petri_net.PetriNet, marking: Dict[int, int], transition: int) -> Dict[int, int]:
+    def fire(net: 'petri_net.PetriNet', marking: Dict[int, int], transition: int) -> Dict[int, int]:
         """
         Method that fires an enabled transitions given a Petri net and a marking, and returns the resulting marking.
         :param net: a Petri net
@@ -41,6 +42,35 @@ class FiringRule:
         else:
             raise TransitionNotEnabledError()
 
+    @staticmethod
+    def fire_step(net: 'petri_net.PetriNet', marking: Dict[int, int], step: Iterable[int]) -> Dict[int, int]:
+        """
+        Method that fires an enabled step (a multiset of transitions fired concurrently) given a Petri net and a marking, and
+        returns the resulting marking. The effect of all the transitions is accumulated and applied to the marking in a
+        single update.
+        :param net: a Petri net
+        :type net: swiftfire.artifacts.nets.petri_net.petri_net.PetriNet
+        :param marking: the current marking of the Petri net
+        :type marking: dictionary of integer: integer
+        :param step: the ids of the transitions to fire
+        :type step: iterable of integers
+        :return: the marking resulting from firing the step in the given Petri net
+        :rtype: dictionary of integer: integer
+        """
+        step = list(step)
+        consumed = Counter()
+        produced = Counter()
+        for transition in step:
+            consumed.update(net.preset(transition))
+            produced.update(net.postset(transition))
+        if not net.enablement_rule.is_step_enabled(net, marking, step, consumed):
+            raise TransitionNotEnabledError()
+        produced.subtract(consumed)
+        for place, tokens in produced.items():
+            if tokens:
+                marking[place] = marking.get(place, 0) + tokens
+        return marking
+
 
 class FiringRuleResetArcs(FiringRule):
     """
@@ -48,7 +78,7 @@ class FiringRuleResetArcs(FiringRule):
     """
 
     @staticmethod
-    def fire(net: petri_net.PetriNet, marking: Dict[int, int], transition: int) -> Dict[int, int]:
+    def fire(net: 'petri_net.PetriNet', marking: Dict[int, int], transition: int) -> Dict[int, int]:
         """
         Method that fires an enabled transitions given a Petri net and a marking, and returns the resulting marking.
         :param net: a Petri net
@@ -62,3 +92,19 @@ class FiringRuleResetArcs(FiringRule):
         """
         # TODO: implement
         raise NotImplementedError
+
+    @staticmethod
+    def fire_step(net: 'petri_net.PetriNet', marking: Dict[int, int], step: Iterable[int]) -> Dict[int, int]:
+        """
+        Method that fires an enabled step (a multiset of transitions fired concurrently) given a Petri net and a marking, and
+        returns the resulting marking.
+        :param net: a Petri net
+        :type net: swiftfire.artifacts.nets.petri_net.petri_net.PetriNet
+        :param marking: the current marking of the Petri net
+        :type marking: dictionary of integer: integer
+        :param step: the ids of the transitions to fire
+        :type step: iterable of integers
+        :return: the marking resulting from firing the step in the given Petri net
+        :rtype: dictionary of integer: integer
+        """
+        raise NotImplementedError('Step semantics are not supported for nets with reset arcs.')
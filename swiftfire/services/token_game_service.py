@@ -0,0 +1,276 @@
+import asyncio
+from typing import Dict, FrozenSet, Hashable, Iterable, Set
+
+from swiftfire.artifacts.nets.petri_net import petri_net
+from swiftfire.semantics.enablement_rules import petri_net_enablement_rules
+from swiftfire.semantics.firing_rules import petri_net_firing_rules
+from swiftfire.semantics.firing_rules.petri_net_firing_rules import TransitionNotEnabledError
+
+
+class CompiledPetriNet:
+    """
+    Class defining a read-only compiled form of a Petri net, with presets and postsets of transitions precomputed,
+    together with the transitions whose enablement can change when each transition fires.
+    """
+
+    def __init__(self, net: petri_net.PetriNet):
+        """
+        Constructor for the compiled Petri net defined by the CompiledPetriNet class.
+        :param net: a Petri net with the standard enablement and firing rules
+        :type net: swiftfire.artifacts.nets.petri_net.petri_net.PetriNet
+        """
+        if net.enablement_rule is not petri_net_enablement_rules.EnablementRule or net.firing_rule is not petri_net_firing_rules.FiringRule:
+            raise ValueError('Only Petri nets with the standard enablement and firing rules can be compiled.')
+        self.__net = net
+        self.__presets = {transition: frozenset(net.preset(transition)) for transition in net.transitions}
+        self.__postsets = {transition: tuple(net.postset(transition)) for transition in net.transitions}
+        consumers = {place: set() for place in net.places}
+        for transition, preset in self.__presets.items():
+            for place in preset:
+                consumers[place].add(transition)
+        # Firing a transition only changes the marking of its preset and postset, hence only the enablement of the
+        # transitions consuming from those places
+        self.__neighborhoods = {transition: frozenset().union(*(consumers[place] for place in self.__presets[transition].union(self.__postsets[transition]))) for transition in net.transitions}
+
+    def __get_net(self):
+        return self.__net
+
+    net = property(__get_net)
+
+    def is_enabled(self, marking: Dict[int, int], transition: int) -> bool:
+        """
+        Checks if a transition is enabled given a marking.
+        :param marking: the current marking of the Petri net
+        :type marking: dictionary of integer: integer
+        :param transition: the id of the transition to be checked
+        :type transition: integer
+        :return: True if the transition is enabled, False otherwise
+        :rtype: boolean
+        """
+        return all(marking.get(place, 0) > 0 for place in self.__presets[transition])
+
+    def enabled_transitions(self, marking: Dict[int, int]) -> Set[int]:
+        """
+        Returns the set of ids of enabled transitions given a marking.
+        :param marking: the current marking of the Petri net
+        :type marking: dictionary of integer: integer
+        :return: the set of ids of the enabled transitions in the net
+        :rtype: set of integers
+        """
+        marked_places = {place for place, tokens in marking.items() if tokens > 0}
+        return {transition for transition, preset in self.__presets.items() if preset <= marked_places}
+
+    def neighborhood(self, transition: int) -> FrozenSet[int]:
+        """
+        Returns the set of ids of the transitions whose enablement can change when a transition fires.
+        :param transition: the id of the fired transition
+        :type transition: integer
+        :return: the set of ids of the transitions consuming from the preset or postset of the fired transition
+        :rtype: frozenset of integers
+        """
+        return self.__neighborhoods[transition]
+
+    def update_enabled(self, marking: Dict[int, int], enabled: Set[int], transitions: Iterable[int]):
+        """
+        Updates in place a set of enabled transitions, re-evaluating only the given transitions against a marking.
+        :param marking: the current marking of the Petri net
+        :type marking: dictionary of integer: integer
+        :param enabled: the set of ids of enabled transitions, up to date except for the given transitions
+        :type enabled: set of integers
+        :param transitions: the ids of the transitions to re-evaluate
+        :type transitions: iterable of integers
+        :return: None
+        :rtype: NoneType
+        """
+        for transition in transitions:
+            if self.is_enabled(marking, transition):
+                enabled.add(transition)
+            else:
+                enabled.discard(transition)
+
+    def fire(self, marking: Dict[int, int], transition: int) -> Dict[int, int]:
+        """
+        Fires an enabled transition given a marking, and returns the resulting marking.
+        :param marking: the current marking of the Petri net
+        :type marking: dictionary of integer: integer
+        :param transition: the id of the transition to fire
+        :type transition: integer
+        :return: the marking resulting from firing the transition
+        :rtype: dictionary of integer: integer
+        """
+        if transition not in self.__presets:
+            raise ValueError('Not a transition of the Petri net.')
+        if not self.is_enabled(marking, transition):
+            raise TransitionNotEnabledError()
+        for place in self.__presets[transition]:
+            marking[place] -= 1
+        for place in self.__postsets[transition]:
+            marking[place] = marking.get(place, 0) + 1
+        return marking
+
+
+class TokenGameService:
+    """
+    Class defining an asyncio service playing the token game on many instances of a few shared Petri net models.
+    Commands are queued per model and processed in batches by one worker task per model. The set of enabled
+    transitions of each instance is kept up to date incrementally: within a batch, firing only marks the neighborhood of
+    the fired transition as stale, and stale transitions are re-evaluated once when the instance is queried or at the
+    end of the batch.
+    """
+
+    def __init__(self, max_batch_size: int = 1024):
+        """
+        Constructor for the token game service defined by the TokenGameService class.
+        :param max_batch_size: the maximum number of commands processed in one batch
+        :type max_batch_size: integer
+        """
+        if max_batch_size < 1:
+            raise ValueError('The maximum batch size must be a positive integer.')
+        self.__max_batch_size = max_batch_size
+        self.__models = {}
+        self.__instances = {}
+        self.__queues = {}
+        self.__workers = {}
+
+    def __get_models(self):
+        return self.__models
+
+    def __get_max_batch_size(self):
+        return self.__max_batch_size
+
+    models = property(__get_models)
+    max_batch_size = property(__get_max_batch_size)
+
+    def add_model(self, model: Hashable, net: petri_net.PetriNet):
+        """
+        Registers a Petri net model, compiling it once for all its instances.
+        :param model: the id of the model
+        :type model: hashable
+        :param net: a Petri net
+        :type net: swiftfire.artifacts.nets.petri_net.petri_net.PetriNet
+        :return: None
+        :rtype: NoneType
+        """
+        if model in self.__models:
+            raise ValueError('Model already registered.')
+        self.__models[model] = CompiledPetriNet(net)
+
+    def add_instance(self, instance: Hashable, model: Hashable, marking: Dict[int, int]):
+        """
+        Registers an instance of a model with its initial marking.
+        :param instance: the id of the instance
+        :type instance: hashable
+        :param model: the id of the model the instance runs on
+        :type model: hashable
+        :param marking: the initial marking of the instance
+        :type marking: dictionary of integer: integer
+        :return: None
+        :rtype: NoneType
+        """
+        if instance in self.__instances:
+            raise ValueError('Instance already registered.')
+        if not self.__models[model].net.is_a_marking(marking):
+            raise ValueError('Invalid marking for the model.')
+        marking = dict(marking)
+        self.__instances[instance] = (model, marking, self.__models[model].enabled_transitions(marking))
+
+    def remove_instance(self, instance: Hashable):
+        """
+        Removes an instance from the service.
+        :param instance: the id of the instance
+        :type instance: hashable
+        :return: None
+        :rtype: NoneType
+        """
+        del self.__instances[instance]
+
+    def marking(self, instance: Hashable) -> Dict[int, int]:
+        """
+        Returns a copy of the current marking of an instance.
+        :param instance: the id of the instance
+        :type instance: hashable
+        :return: the current marking of the instance
+        :rtype: dictionary of integer: integer
+        """
+        return dict(self.__instances[instance][1])
+
+    async def fire(self, instance: Hashable, transition: int) -> Dict[int, int]:
+        """
+        Fires a transition in an instance, and returns a copy of the resulting marking.
+        :param instance: the id of the instance
+        :type instance: hashable
+        :param transition: the id of the transition to fire
+        :type transition: integer
+        :return: the marking of the instance after firing the transition
+        :rtype: dictionary of integer: integer
+        """
+        return await self.__submit(instance, 'fire', transition)
+
+    async def enabled(self, instance: Hashable) -> Set[int]:
+        """
+        Returns the set of ids of the transitions enabled in an instance.
+        :param instance: the id of the instance
+        :type instance: hashable
+        :return: the set of ids of the enabled transitions
+        :rtype: set of integers
+        """
+        return await self.__submit(instance, 'enabled', None)
+
+    async def close(self):
+        """
+        Stops the worker tasks of the service. Pending commands are cancelled.
+        :return: None
+        :rtype: NoneType
+        """
+        workers = list(self.__workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for queue in self.__queues.values():
+            while not queue.empty():
+                queue.get_nowait()[3].cancel()
+        self.__workers.clear()
+        self.__queues.clear()
+
+    async def __submit(self, instance: Hashable, command: str, argument):
+        model = self.__instances[instance][0]
+        if model not in self.__queues:
+            self.__queues[model] = asyncio.Queue()
+        if model not in self.__workers or self.__workers[model].done():
+            self.__workers[model] = asyncio.ensure_future(self.__work(model, self.__queues[model]))
+        future = asyncio.get_event_loop().create_future()
+        self.__queues[model].put_nowait((instance, command, argument, future))
+        return await future
+
+    async def __work(self, model: Hashable, queue: asyncio.Queue):
+        compiled_net = self.__models[model]
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.__max_batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            self.__process_batch(compiled_net, batch)
+            # Yield to let the submitters enqueue the next batch
+            await asyncio.sleep(0)
+
+    def __process_batch(self, compiled_net: CompiledPetriNet, batch):
+        # Transitions of each instance whose enablement may be stale after the fires in this batch
+        stale = {}
+        for instance, command, argument, future in batch:
+            if future.done():
+                continue
+            try:
+                model, marking, enabled = self.__instances[instance]
+                if command == 'enabled':
+                    if instance in stale:
+                        compiled_net.update_enabled(marking, enabled, stale.pop(instance))
+                    future.set_result(set(enabled))
+                else:
+                    compiled_net.fire(marking, argument)
+                    stale.setdefault(instance, set()).update(compiled_net.neighborhood(argument))
+                    future.set_result(dict(marking))
+            except Exception as error:
+                future.set_exception(error)
+        for instance, transitions in stale.items():
+            if instance in self.__instances:
+                model, marking, enabled = self.__instances[instance]
+                compiled_net.update_enabled(marking, enabled, transitions)
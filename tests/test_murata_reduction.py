@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+
+"""Tests for the Murata reduction rules."""
+
+
+import time
+import unittest
+from collections import deque
+from random import Random
+
+from swiftfire.algorithms.reduction.murata_reduction import MurataReduction
+from swiftfire.artifacts.graphs.swiftfire_graph import SwiftFireGraph
+from swiftfire.artifacts.nets.petri_net.petri_net import PetriNet
+
+
+def behavioural_properties(net, marking, bound=6):
+    """
+    Explore the reachability graph of a small net, and return whether it is bounded, safe, live and deadlock-free.
+    Nets where a place exceeds the bound are deemed unbounded, and their other properties are not computed.
+    """
+    places = sorted(net.places)
+    transitions = sorted(net.transitions)
+    initial = tuple(marking.get(place, 0) for place in places)
+    successors = {}
+    queue = deque([initial])
+    while queue:
+        state = queue.popleft()
+        if state in successors:
+            continue
+        current = dict(zip(places, state))
+        successors[state] = []
+        for transition in net.enablement_rule.enabled_transitions(net, current):
+            fired = net.firing_rule.fire(net, dict(current), transition)
+            successor = tuple(fired.get(place, 0) for place in places)
+            if max(successor, default=0) > bound:
+                return False, False, None, None
+            successors[state].append((transition, successor))
+            queue.append(successor)
+    safe = all(max(state, default=0) <= 1 for state in successors)
+    deadlock_free = all(successors[state] for state in successors)
+    predecessors = {state: set() for state in successors}
+    for state, edges in successors.items():
+        for _, successor in edges:
+            predecessors[successor].add(state)
+    live = True
+    for transition in transitions:
+        # States from which the transition can eventually fire
+        reaching = {state for state, edges in successors.items() if any(fired == transition for fired, _ in edges)}
+        queue = deque(reaching)
+        while queue:
+            for predecessor in predecessors[queue.popleft()]:
+                if predecessor not in reaching:
+                    reaching.add(predecessor)
+                    queue.append(predecessor)
+        if len(reaching) != len(successors):
+            live = False
+            break
+    return True, safe, live, deadlock_free
+
+
+def nested_fork_join(depth):
+    """
+    Build a graph of fork/join diamonds nested in each other: each fork sends a token to a place and to the next fork,
+    and each join waits for the place and the nested diamond. Reducing it alternates series fusions and eliminations
+    of parallel places from the innermost diamond outwards.
+    """
+    types, arcs = [0], []
+
+    def node(node_type):
+        types.append(node_type)
+        return len(types) - 1
+
+    entry, branches = 0, []
+    for _ in range(depth):
+        fork, inner, branch = node(1), node(0), node(0)
+        arcs += [(entry, fork), (fork, inner), (fork, branch)]
+        branches.append(branch)
+        entry = inner
+    for branch in reversed(branches):
+        join, out = node(1), node(0)
+        arcs += [(entry, join), (branch, join), (join, out)]
+        entry = out
+    return SwiftFireGraph(types, arcs)
+
+
+class TestMurataReduction(unittest.TestCase):
+    """Tests for `MurataReduction`."""
+
+    def test_fusion_of_series_transitions(self):
+        """Test that p1 and t4 are fused into t3."""
+        net = PetriNet(3, 2, [(0, 3), (3, 1), (1, 4), (4, 2)])
+        result = MurataReduction.reduce_net(net, {0: 1})
+        self.assertEqual(sorted(result.net.graph.get_edgelist()), [(0, 2), (2, 1)])
+        self.assertEqual(result.marking, {0: 1})
+        self.assertEqual(result.mapping, {0: (0,), 1: (2,), 2: (1, 3, 4)})
+        self.assertEqual(result.eliminated, set())
+
+    def test_fusion_of_series_places(self):
+        """Test that p1 and t4 are fused into p2, summing their tokens, when p1 is marked."""
+        net = PetriNet(3, 2, [(0, 3), (3, 1), (1, 4), (4, 2)])
+        result = MurataReduction.reduce_net(net, {0: 1, 1: 1})
+        self.assertEqual(sorted(result.net.graph.get_edgelist()), [(0, 2), (2, 1)])
+        self.assertEqual(result.marking, {0: 1, 1: 1})
+        self.assertEqual(result.mapping, {0: (0,), 1: (1, 2, 4), 2: (3,)})
+
+    def test_no_fusion_at_source_or_sink(self):
+        """Test that series nodes are not fused with a place without inputs or a transition without outputs."""
+        # p0 has no input transitions, t4 has no output places
+        net = PetriNet(2, 2, [(0, 2), (2, 1), (1, 3)])
+        result = MurataReduction.reduce_net(net, {0: 1})
+        self.assertEqual(len(result.mapping), 4)
+
+    def test_elimination_of_self_loop_places(self):
+        """Test that a self-loop place is eliminated only if it holds exactly one token."""
+        net = PetriNet(2, 1, [(0, 2), (2, 0), (2, 1)])
+        result = MurataReduction.reduce_net(net, {0: 1})
+        self.assertEqual(result.eliminated, {0})
+        self.assertEqual(result.mapping, {0: (1,), 1: (2,)})
+        self.assertEqual(sorted(result.net.graph.get_edgelist()), [(1, 0)])
+        self.assertEqual(MurataReduction.reduce_net(net, {0: 2}).eliminated, set())
+
+    def test_elimination_of_parallel_places(self):
+        """Test that parallel places are eliminated only if they have the same marking."""
+        net = PetriNet(4, 2, [(0, 4), (4, 1), (4, 2), (1, 5), (2, 5), (5, 3)])
+        result = MurataReduction.reduce_net(net, {0: 1})
+        self.assertEqual(result.eliminated, {2})
+        self.assertEqual(result.mapping, {0: (0,), 1: (1, 3, 5), 2: (4,)})
+        self.assertEqual(sorted(result.net.graph.get_edgelist()), [(0, 2), (2, 1)])
+        self.assertEqual(MurataReduction.reduce_net(net, {0: 1, 1: 1}).eliminated, set())
+
+    def test_reduce_graph(self):
+        """Test the reduction of a bipartite graph and the validation of its marking."""
+        graph = SwiftFireGraph([0, 1, 0, 1, 0], [(0, 1), (1, 2), (2, 3), (3, 4)])
+        result = MurataReduction.reduce_graph(graph, {0: 1})
+        self.assertIsInstance(result.net, SwiftFireGraph)
+        self.assertEqual(result.net.vs['type'], [0, 0, 1])
+        self.assertEqual(result.mapping, {0: (0,), 1: (4,), 2: (1, 2, 3)})
+        for marking in [{5: 1}, {1: 1}, {0: -1}]:
+            with self.assertRaises(ValueError):
+                MurataReduction.reduce_graph(graph, marking)
+
+    def test_deep_nested_net(self):
+        """Test that a deep nested net is fully reduced in time linear in its size, without rescans of the net."""
+        graph = nested_fork_join(5000)
+        start = time.perf_counter()
+        result = MurataReduction.reduce_graph(graph, {0: 1})
+        elapsed = time.perf_counter() - start
+        self.assertEqual(result.net.vs['type'], [0, 0, 1])
+        original_nodes = [node for nodes in result.mapping.values() for node in nodes] + list(result.eliminated)
+        self.assertEqual(sorted(original_nodes), list(range(graph.vcount())))
+        # Takes well under a second; repeated rescans of the net took minutes
+        self.assertLess(elapsed, 5)
+
+    def test_reduce_net_invalid(self):
+        """Test that invalid markings and nets with non-standard rules are rejected."""
+        net = PetriNet(2, 1, [(0, 2), (2, 1)])
+        with self.assertRaises(ValueError):
+            MurataReduction.reduce_net(net, {2: 1})
+        with self.assertRaises(ValueError):
+            MurataReduction.reduce_net(PetriNet(2, 1, [(0, 2)], reset_arcs=[(1, 2)]), {0: 1})
+
+    def test_properties_preserved(self):
+        """Test that boundedness, safeness, liveness and deadlock-freedom are preserved on random small nets."""
+        rng = Random(0)
+        reduced = 0
+        for _ in range(1000):
+            places, transitions = rng.randint(1, 5), rng.randint(1, 5)
+            arcs = set()
+            for transition in range(places, places + transitions):
+                for place in range(places):
+                    if rng.random() < 0.3:
+                        arcs.add((place, transition))
+                    if rng.random() < 0.3:
+                        arcs.add((transition, place))
+            marking = {place: rng.randint(0, 1) for place in range(places)}
+            net = PetriNet(places, transitions, sorted(arcs))
+            result = MurataReduction.reduce_net(net, marking)
+            if len(result.mapping) == places + transitions:
+                continue
+            reduced += 1
+            self.assertEqual(behavioural_properties(net, marking), behavioural_properties(result.net, result.marking),
+                             'arcs {}, marking {}'.format(sorted(arcs), marking))
+        self.assertGreater(reduced, 100)
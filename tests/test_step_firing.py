@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""Tests for the step firing semantics of Petri nets."""
+
+
+import unittest
+from random import Random
+
+from swiftfire.artifacts.nets.petri_net.petri_net import PetriNet
+from swiftfire.semantics.firing_rules.petri_net_firing_rules import TransitionNotEnabledError
+
+
+class TestStepFiring(unittest.TestCase):
+    """Tests for step enablement and step firing."""
+
+    def setUp(self):
+        """Set up a net where t4 and t6 conflict on p0, and t5 is independent of both."""
+        # t4: p0 -> p2, t5: p1 -> p3, t6: p0 -> p3
+        self.net = PetriNet(4, 3, [(0, 4), (4, 2), (1, 5), (5, 3), (0, 6), (6, 3)])
+
+    def test_maximal_step_excludes_conflicts(self):
+        """Test that a maximal step does not contain conflicting transitions."""
+        step = self.net.enablement_rule.maximal_step(self.net, {0: 1, 1: 1})
+        self.assertEqual(step, {4, 5})
+        for seed in range(10):
+            step = self.net.enablement_rule.maximal_step(self.net, {0: 1, 1: 1}, Random(seed))
+            self.assertIn(5, step)
+            self.assertEqual(len(step & {4, 6}), 1)
+
+    def test_maximal_step_shared_place_with_multiple_tokens(self):
+        """Test that transitions sharing a place can be in the same step if the place has enough tokens."""
+        self.assertEqual(self.net.enablement_rule.maximal_step(self.net, {0: 2, 1: 1}), {4, 5, 6})
+
+    def test_is_step_enabled(self):
+        """Test step enablement with conflicts and multiple tokens."""
+        rule = self.net.enablement_rule
+        self.assertTrue(rule.is_step_enabled(self.net, {0: 1, 1: 1}, [4, 5]))
+        self.assertFalse(rule.is_step_enabled(self.net, {0: 1, 1: 1}, [4, 6]))
+        self.assertTrue(rule.is_step_enabled(self.net, {0: 2}, [4, 6]))
+        self.assertFalse(rule.is_step_enabled(self.net, {0: 1}, [4, 4]))
+        self.assertTrue(rule.is_step_enabled(self.net, {}, []))
+
+    def test_fire_step(self):
+        """Test that firing a step has the effect of firing its transitions in sequence."""
+        marking = self.net.firing_rule.fire_step(self.net, {0: 2, 1: 1}, [4, 5, 6])
+        self.assertEqual(marking, {0: 0, 1: 0, 2: 1, 3: 2})
+        sequential = {0: 2, 1: 1}
+        for transition in [4, 5, 6]:
+            sequential = self.net.firing_rule.fire(self.net, sequential, transition)
+        self.assertEqual(marking, sequential)
+
+    def test_fire_step_not_enabled(self):
+        """Test that firing a conflicting step raises an error and leaves the marking untouched."""
+        marking = {0: 1, 1: 1}
+        with self.assertRaises(TransitionNotEnabledError):
+            self.net.firing_rule.fire_step(self.net, marking, [4, 6])
+        self.assertEqual(marking, {0: 1, 1: 1})
+
+    def test_fire_empty_step(self):
+        """Test that firing the empty step leaves the marking unchanged."""
+        self.assertEqual(self.net.firing_rule.fire_step(self.net, {0: 1}, []), {0: 1})
+        self.assertEqual(self.net.enablement_rule.maximal_step(self.net, {}), set())
+
+    def test_fire_step_self_loop(self):
+        """Test that a self-loop place needs a token per transition of the step, and keeps its tokens."""
+        # p0 is a self-loop place of both t2 and t3
+        net = PetriNet(2, 2, [(0, 2), (2, 0), (0, 3), (3, 0), (3, 1)])
+        self.assertEqual(net.enablement_rule.maximal_step(net, {0: 1}), {2})
+        self.assertEqual(net.enablement_rule.maximal_step(net, {0: 2}), {2, 3})
+        self.assertEqual(net.firing_rule.fire_step(net, {0: 2}, [2, 3]), {0: 2, 1: 1})
+
+    def test_non_standard_rules(self):
+        """Test that step semantics are not silently applied to nets with inhibitor or reset arcs."""
+        net = PetriNet(2, 1, [(0, 2), (2, 1)], reset_arcs=[(1, 2)])
+        with self.assertRaisesRegex(NotImplementedError, 'reset arcs'):
+            net.firing_rule.fire_step(net, {0: 1, 1: 5}, [2])
+        net = PetriNet(2, 1, [(0, 2)], inhibitor_arcs=[(1, 2)])
+        with self.assertRaises(NotImplementedError):
+            net.enablement_rule.maximal_step(net, {0: 1, 1: 1})
+        with self.assertRaisesRegex(NotImplementedError, 'inhibitor arcs'):
+            net.firing_rule.fire_step(net, {0: 1, 1: 1}, [2])
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+"""Tests for the asyncio token game service."""
+
+
+import asyncio
+import unittest
+from random import Random
+
+from swiftfire.artifacts.nets.petri_net.petri_net import PetriNet
+from swiftfire.semantics.firing_rules.petri_net_firing_rules import TransitionNotEnabledError
+from swiftfire.services.token_game_service import CompiledPetriNet, TokenGameService
+
+
+def build_net():
+    """Build a cyclic net: t5 forks p0 into p1 and p2, t6 and t7 move them to p3 and p4, and t8 joins them into p0."""
+    return PetriNet(5, 4, [(0, 5), (5, 1), (5, 2), (1, 6), (6, 3), (2, 7), (7, 4), (3, 8), (4, 8), (8, 0)])
+
+
+class TestCompiledPetriNet(unittest.TestCase):
+    """Tests for `CompiledPetriNet`."""
+
+    def setUp(self):
+        """Set up a compiled net."""
+        self.net = build_net()
+        self.compiled_net = CompiledPetriNet(self.net)
+
+    def test_enabled_and_fire(self):
+        """Test enablement and firing against the net's own rules."""
+        marking = {0: 1}
+        self.assertEqual(self.compiled_net.enabled_transitions(marking), {5})
+        self.assertEqual(self.compiled_net.fire(marking, 5), {0: 0, 1: 1, 2: 1})
+        self.assertEqual(self.compiled_net.enabled_transitions(marking), self.net.enablement_rule.enabled_transitions(self.net, marking))
+        with self.assertRaises(TransitionNotEnabledError):
+            self.compiled_net.fire(marking, 8)
+        with self.assertRaises(ValueError):
+            self.compiled_net.fire(marking, 0)
+
+    def test_incremental_enablement(self):
+        """Test that updating the neighborhood of fired transitions matches a full evaluation."""
+        rng = Random(0)
+        marking = {0: 2}
+        enabled = self.compiled_net.enabled_transitions(marking)
+        for _ in range(100):
+            transition = rng.choice(sorted(enabled))
+            self.compiled_net.fire(marking, transition)
+            self.compiled_net.update_enabled(marking, enabled, self.compiled_net.neighborhood(transition))
+            self.assertEqual(enabled, self.compiled_net.enabled_transitions(marking))
+
+    def test_non_standard_rules(self):
+        """Test that nets with inhibitor or reset arcs are rejected."""
+        with self.assertRaises(ValueError):
+            CompiledPetriNet(PetriNet(2, 1, [(0, 2)], inhibitor_arcs=[(1, 2)]))
+
+
+class TestTokenGameService(unittest.TestCase):
+    """Tests for `TokenGameService`."""
+
+    def setUp(self):
+        """Set up a service with two instances of the same model."""
+        self.loop = asyncio.new_event_loop()
+        self.service = TokenGameService()
+        self.service.add_model('model', build_net())
+        self.service.add_instance('a', 'model', {0: 1})
+        self.service.add_instance('b', 'model', {0: 1})
+
+    def tearDown(self):
+        """Stop the service and close the event loop."""
+        self.loop.run_until_complete(self.service.close())
+        self.loop.close()
+
+    def run_async(self, coroutine):
+        """Run a coroutine to completion on the test event loop."""
+        return self.loop.run_until_complete(coroutine)
+
+    def test_fire_and_enabled(self):
+        """Test that instances evolve independently."""
+        self.assertEqual(self.run_async(self.service.enabled('a')), {5})
+        self.assertEqual(self.run_async(self.service.fire('a', 5)), {0: 0, 1: 1, 2: 1})
+        self.assertEqual(self.run_async(self.service.enabled('a')), {6, 7})
+        self.assertEqual(self.run_async(self.service.enabled('b')), {5})
+        self.assertEqual(self.service.marking('b'), {0: 1})
+
+    def test_batched_commands(self):
+        """Test that commands submitted concurrently are processed in order per instance."""
+        async def play():
+            return await asyncio.gather(
+                self.service.fire('a', 5), self.service.enabled('a'), self.service.fire('a', 6),
+                self.service.fire('a', 7), self.service.enabled('a'), self.service.enabled('b'))
+        results = self.run_async(play())
+        self.assertEqual(results[1], {6, 7})
+        self.assertEqual(results[4], {8})
+        self.assertEqual(results[5], {5})
+        self.assertEqual(self.run_async(self.service.enabled('a')), {8})
+
+    def test_invalid_transitions(self):
+        """Test that invalid commands fail without stopping the model's worker."""
+        with self.assertRaises(TransitionNotEnabledError):
+            self.run_async(self.service.fire('a', 8))
+        with self.assertRaises(ValueError):
+            self.run_async(self.service.fire('a', 0))
+        with self.assertRaises(TypeError):
+            self.run_async(asyncio.wait_for(self.service.fire('a', [5]), 1))
+        self.assertEqual(self.run_async(asyncio.wait_for(self.service.fire('a', 5), 1)), {0: 0, 1: 1, 2: 1})
+
+    def test_removed_instance(self):
+        """Test that commands on removed instances fail."""
+        self.service.remove_instance('a')
+        with self.assertRaises(KeyError):
+            self.run_async(self.service.enabled('a'))
+        with self.assertRaises(ValueError):
+            self.service.add_instance('b', 'model', {0: 1})
+
+    def test_close_cancels_pending_commands(self):
+        """Test that closing the service cancels commands not processed yet."""
+        async def close_with_pending_command():
+            pending = asyncio.ensure_future(self.service.fire('a', 5))
+            await asyncio.sleep(0)
+            await self.service.close()
+            return await asyncio.gather(pending, return_exceptions=True)
+        result, = self.run_async(close_with_pending_command())
+        self.assertIsInstance(result, asyncio.CancelledError)
+        self.assertEqual(self.service.marking('a'), {0: 1})